@@ -1,11 +1,15 @@
 from fastapi import FastAPI, UploadFile, File, Query, Depends, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from datetime import datetime, timezone
-from typing import List, Optional
+from typing import List, Literal, Optional
 import logging
 import traceback
+import numpy as np
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from .schemas import (
     PlacementRequest, PlacementResponse,
@@ -22,6 +26,7 @@ from .services.waste import WasteManagementService
 from .services.simulation import SimulationService
 from .services.logging import LoggingService
 from .utils.database import get_db, init_db
+from .utils.cache import cache
 from .utils.csv_handler import CSVHandler
 from .utils.error_handling import InventoryError
 from .middleware.error_handler import error_handler_middleware
@@ -29,7 +34,14 @@ import os
 
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Space Station Inventory Management System")
+# Valid /api/logs action filters; a Literal is checked by membership
+# instead of running a regex per request
+ActionType = Literal["placement", "retrieval", "rearrangement", "disposal"]
+
+app = FastAPI(
+    title="Space Station Inventory Management System",
+    default_response_class=ORJSONResponse
+)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -37,8 +49,14 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 # Favicon route
 app.mount("/favicon.ico", StaticFiles(directory="static/images", html=False), name="favicon")
 
-# Configure templates
+# Configure templates; outside debug runs, keep compiled templates cached
+# instead of re-statting the files on every request
+DEBUG = os.getenv("DEBUG", "").lower() in ("1", "true", "yes")
+
 templates = Jinja2Templates(directory="templates")
+if not DEBUG:
+    templates.env.auto_reload = False
+    templates.env.cache_size = 400
 
 # Add error handling middleware
 app.middleware("http")(error_handler_middleware)
@@ -53,6 +71,15 @@ logging_service = LoggingService()
 # Initialize database
 init_db()
 
+@app.on_event("startup")
+async def prewarm_connections():
+    """Open the pool's connections up front so the first wave of requests
+    after a deploy doesn't pay connection-setup latency."""
+    from .utils.database import engine
+    connections = [engine.connect() for _ in range(engine.pool.size())]
+    for connection in connections:
+        connection.close()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -62,13 +89,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON/CSV payloads (logs, waste lists, arrangement exports)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Frontend routes
 @app.get("/")
 async def home(request: Request):
     return templates.TemplateResponse("home.html", {"request": request})
 
 @app.get("/inventory")
-async def inventory_page(request: Request, db: Session = Depends(get_db)):
+def inventory_page(request: Request, db: Session = Depends(get_db)):
     containers = db.query(Container).all()
     return templates.TemplateResponse("inventory.html", {
         "request": request,
@@ -84,20 +114,24 @@ async def simulation_page(request: Request):
     return templates.TemplateResponse("simulation.html", {"request": request})
 
 # API routes
-@app.post("/api/placement", response_model=PlacementResponse)
-async def placement_recommendations(
+@app.post("/api/placement")
+def placement_recommendations(
     request: PlacementRequest,
     db: Session = Depends(get_db)
 ):
     try:
-        # Validate containers exist in database
-        for container in request.containers:
-            db_container = db.query(Container).filter(Container.id == container.container_id).first()
-            if not db_container:
-                raise InventoryError(
-                    f"Container {container.container_id} not found in database",
-                    {"containerId": container.container_id}
-                )
+        # Validate containers exist in database with a single IN query
+        requested_ids = {container.container_id for container in request.containers}
+        found_ids = {
+            row[0] for row in
+            db.query(Container.id).filter(Container.id.in_(requested_ids)).all()
+        }
+        missing_ids = requested_ids - found_ids
+        if missing_ids:
+            raise InventoryError(
+                f"Containers not found in database: {', '.join(sorted(missing_ids))}",
+                {"containerIds": sorted(missing_ids)}
+            )
 
         # Get placements and rearrangements
         placements, rearrangements = placement_service.optimize_placement(
@@ -112,40 +146,70 @@ async def placement_recommendations(
             if item.item_id not in placed_item_ids
         ]
 
-        # Calculate space utilization for each container
-        space_utilization = {}
-        for container in request.containers:
-            container_placements = [p for p in placements if p.container_id == container.container_id]
-            total_volume = container.width * container.depth * container.height
-            used_volume = sum(
-                (p.position.end_coordinates.width - p.position.start_coordinates.width) *
-                (p.position.end_coordinates.depth - p.position.start_coordinates.depth) *
-                (p.position.end_coordinates.height - p.position.start_coordinates.height)
-                for p in container_placements
+        # Calculate space utilization for each container in one vectorized
+        # pass: placement volumes via np.prod, per-container sums via bincount
+        cid_map = {c.container_id: idx for idx, c in enumerate(request.containers)}
+        total_volumes = np.array(
+            [c.width * c.depth * c.height for c in request.containers]
+        )
+        if placements:
+            boxes = np.array([p._box for p in placements])
+            starts = boxes[:, :3]
+            ends = boxes[:, 3:]
+            cid_idx = np.fromiter(
+                (cid_map[p.container_id] for p in placements),
+                dtype=np.int32,
+                count=len(placements)
             )
-            utilization = (used_volume / total_volume) * 100 if total_volume > 0 else 0
-            space_utilization[container.container_id] = round(utilization, 2)
-
-        # Update database with placements
-        for placement in placements:
-            item = db.query(Item).filter(Item.id == placement.item_id).first()
-            if item:
-                item.container_id = placement.container_id
-                item.position = {
-                    "startCoordinates": placement.position.startCoordinates,
-                    "endCoordinates": placement.position.endCoordinates
-                }
-                db.add(item)
+            volumes = np.prod(ends - starts, axis=1)
+            used_volumes = np.bincount(
+                cid_idx, weights=volumes, minlength=len(request.containers)
+            )
+        else:
+            used_volumes = np.zeros(len(request.containers))
+
+        utilization = np.divide(
+            used_volumes * 100, total_volumes,
+            out=np.zeros_like(used_volumes), where=total_volumes > 0
+        )
+        space_utilization = {
+            container_id: round(float(utilization[idx]), 2)
+            for container_id, idx in cid_map.items()
+        }
+
+        # Update database with placements in bulk: one IN query to find the
+        # affected items, one executemany UPDATE instead of 2N round-trips
+        placement_ids = [p.item_id for p in placements]
+        existing_ids = {
+            row[0] for row in
+            db.query(Item.itemId).filter(Item.itemId.in_(placement_ids)).all()
+        }
+        db.bulk_update_mappings(Item, [
+            {
+                "itemId": p.item_id,
+                "container_id": p.container_id,
+                "position": (position_dict := {
+                    "startCoordinates": p.position.startCoordinates,
+                    "endCoordinates": p.position.endCoordinates
+                }),
+                **Item.flat_position(position_dict)
+            }
+            for p in placements if p.item_id in existing_ids
+        ])
 
         db.commit()
+        cache.delete_prefix("container_items:")
 
-        return PlacementResponse(
+        # The payload was constructed server-side, so return it directly
+        # rather than paying for a response_model re-validation pass
+        response = PlacementResponse(
             success=True,
             placements=placements,
             rearrangements=rearrangements,
             unplacedItems=unplaced_items,
             spaceUtilization=space_utilization
         )
+        return ORJSONResponse(content=response.model_dump(by_alias=True))
 
     except InventoryError as e:
         raise HTTPException(
@@ -160,16 +224,19 @@ async def placement_recommendations(
         )
 
 @app.get("/api/search", response_model=SearchResponse)
-async def search_item(
+def search_item(
     itemId: Optional[str] = None,
     itemName: Optional[str] = None,
     userId: Optional[str] = None,
+    includeCounts: bool = False,
     db: Session = Depends(get_db)
 ):
-    return search_service.search_item(db, itemId, itemName)
+    return search_service.search_item(
+        db, itemId, itemName, include_counts=includeCounts
+    )
 
 @app.post("/api/retrieve")
-async def retrieve_item(
+def retrieve_item(
     request: RetrievalRequest,
     db: Session = Depends(get_db)
 ):
@@ -188,7 +255,7 @@ async def retrieve_item(
     return {"success": success}
 
 @app.post("/api/place")
-async def place_item(
+def place_item(
     request: PlaceItemRequest,
     db: Session = Depends(get_db)
 ):
@@ -203,12 +270,12 @@ async def place_item(
     return {"success": success}
 
 @app.get("/api/waste/identify", response_model=WasteResponse)
-async def identify_waste(db: Session = Depends(get_db)):
+def identify_waste(db: Session = Depends(get_db)):
     waste_items = waste_service.identify_waste_items(db)
     return WasteResponse(success=True, wasteItems=waste_items)
 
 @app.post("/api/waste/return-plan", response_model=ReturnPlanResponse)
-async def get_return_plan(
+def get_return_plan(
     request: ReturnPlanRequest,
     db: Session = Depends(get_db)
 ):
@@ -224,7 +291,7 @@ async def get_return_plan(
     )
 
 @app.post("/api/waste/complete-undocking")
-async def complete_undocking(
+def complete_undocking(
     undockingContainerId: str,
     timestamp: datetime,
     db: Session = Depends(get_db)
@@ -237,7 +304,7 @@ async def complete_undocking(
     return {"success": success}
 
 @app.post("/api/simulate/day")
-async def simulate_days(
+def simulate_days(
     request: SimulationRequest,
     db: Session = Depends(get_db)
 ):
@@ -248,9 +315,12 @@ async def import_items(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    contents = await file.read()
-    result = await CSVHandler.import_items(db, contents)
+    result = await CSVHandler.import_items(db, file.file)
     db.commit()  # Ensure changes are committed
+    cache.delete("items:exists")
+    # The import replaced the whole items table; cached per-container
+    # blocking rows would reference deleted items for up to their TTL
+    cache.delete_prefix("container_items:")
     return {
         "success": result.get("success", False),
         "itemsImported": result.get("itemsImported", 0),
@@ -263,26 +333,33 @@ async def import_containers(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
-    contents = await file.read()
-    result = await CSVHandler.import_containers(db, contents)
+    result = await CSVHandler.import_containers(db, file.file)
     db.commit()  # Ensure changes are committed
+    cache.delete("containers:exists")
+    cache.delete_prefix("container:")
+    cache.delete_prefix("container_items:")
     return result
 
 @app.get("/api/export/arrangement")
-async def export_arrangement(db: Session = Depends(get_db)):
-    csv_content = CSVHandler.export_arrangement(db)
-    return {"content": csv_content}
+def export_arrangement(db: Session = Depends(get_db)):
+    # Stream CSV chunks straight to the socket instead of building one
+    # monolithic string and re-encoding it inside a JSON envelope
+    return StreamingResponse(
+        CSVHandler.export_arrangement(db),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="arrangement.csv"'}
+    )
 
-@app.get("/api/logs", response_model=LogResponse)
-async def get_logs(
+@app.get("/api/logs")
+def get_logs(
     startDate: datetime,
     endDate: datetime,
     itemId: Optional[str] = None,
     userId: Optional[str] = None,
-    actionType: Optional[str] = Query(None, regex="^(placement|retrieval|rearrangement|disposal)$"),
+    actionType: Optional[ActionType] = None,
     db: Session = Depends(get_db)
 ):
-    return logging_service.get_logs(
+    result = logging_service.get_logs(
         db,
         startDate,
         endDate,
@@ -290,53 +367,78 @@ async def get_logs(
         userId,
         actionType
     )
+    return ORJSONResponse(content=result.model_dump(by_alias=True))
 
 @app.get("/api/containers/check")
-async def check_containers(db: Session = Depends(get_db)):
-    count = db.query(Container).count()
-    return {"containersExist": count > 0}
+def check_containers(db: Session = Depends(get_db)):
+    cached = cache.get("containers:exists")
+    if cached is not None:
+        return cached
+    # Stop at the first row instead of counting the whole table
+    exists = db.query(Container.id).limit(1).first() is not None
+    response = {"containersExist": exists}
+    cache.set("containers:exists", response, ttl=60)
+    return response
 
 @app.get("/api/items/check")
-async def check_items(db: Session = Depends(get_db)):
-    count = db.query(Item).count()
-    return {"itemsExist": count > 0}
+def check_items(db: Session = Depends(get_db)):
+    cached = cache.get("items:exists")
+    if cached is not None:
+        return cached
+    exists = db.query(Item.itemId).limit(1).first() is not None
+    response = {"itemsExist": exists}
+    cache.set("items:exists", response, ttl=60)
+    return response
 
 @app.get("/api/containers/{container_id}")
-async def get_container(container_id: str, db: Session = Depends(get_db)):
+def get_container(container_id: str, db: Session = Depends(get_db)):
+    cache_key = f"container:{container_id}"
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
     container = db.query(Container).filter(Container.id == container_id).first()
     if not container:
         raise HTTPException(status_code=404, detail="Container not found")
-    return {
+    response = {
         "id": container.id,
         "zone": container.zone,
         "width": container.width,
         "depth": container.depth,
         "height": container.height
     }
+    cache.set(cache_key, response, ttl=300)
+    return response
 
 @app.get("/api/containers/{container_id}/items")
-async def get_container_items(container_id: str, db: Session = Depends(get_db)):
-    items = db.query(Item).filter(
-        Item.container_id == container_id,
-        Item.is_waste == False
+def get_container_items(container_id: str, db: Session = Depends(get_db)):
+    # Select only the returned columns instead of hydrating Item objects
+    rows = db.execute(
+        select(
+            Item.itemId, Item.name, Item.width, Item.depth, Item.height,
+            Item.mass, Item.priority, Item.position, Item.expiry_date,
+            Item.usage_limit, Item.uses_remaining, Item.preferred_zone
+        ).where(
+            Item.container_id == container_id,
+            Item.is_waste == False
+        )
     ).all()
     return [{
-        "itemId": item.itemId,
-        "name": item.name,
-        "width": item.width,
-        "depth": item.depth,
-        "height": item.height,
-        "mass": item.mass,
-        "priority": item.priority,
-        "position": item.position,
-        "expiryDate": item.expiry_date.isoformat() if item.expiry_date else None,
-        "usageLimit": item.usage_limit,
-        "usesRemaining": item.uses_remaining,
-        "preferredZone": item.preferred_zone
-    } for item in items]
+        "itemId": row.itemId,
+        "name": row.name,
+        "width": row.width,
+        "depth": row.depth,
+        "height": row.height,
+        "mass": row.mass,
+        "priority": row.priority,
+        "position": row.position,
+        "expiryDate": row.expiry_date.isoformat() if row.expiry_date else None,
+        "usageLimit": row.usage_limit,
+        "usesRemaining": row.uses_remaining,
+        "preferredZone": row.preferred_zone
+    } for row in rows]
 
 @app.post("/api/placement/optimize")
-async def optimize_placement(db: Session = Depends(get_db)):
+def optimize_placement(db: Session = Depends(get_db)):
     try:
         # Get all unplaced and non-waste items
         items = db.query(Item).filter(
@@ -380,22 +482,30 @@ async def optimize_placement(db: Session = Depends(get_db)):
             "height": container.height
         } for container in containers]
             
-        # Use placement service to optimize
-        placement_service = PlacementService()
+        # Use the shared placement service to optimize
         placements, rearrangements = placement_service.optimize_placement(items_input, containers_input)
         
-        # Update item positions in database
-        for placement in placements:
-            item = db.query(Item).filter(Item.itemId == placement.item_id).first()
-            if item:
-                item.container_id = placement.container_id
-                item.position = {
-                    "startCoordinates": placement.position.startCoordinates,
-                    "endCoordinates": placement.position.endCoordinates
-                }
-                db.add(item)
-                
+        # Update item positions in bulk rather than one SELECT + UPDATE per item
+        placement_ids = [p.item_id for p in placements]
+        existing_ids = {
+            row[0] for row in
+            db.query(Item.itemId).filter(Item.itemId.in_(placement_ids)).all()
+        }
+        db.bulk_update_mappings(Item, [
+            {
+                "itemId": p.item_id,
+                "container_id": p.container_id,
+                "position": (position_dict := {
+                    "startCoordinates": p.position.startCoordinates,
+                    "endCoordinates": p.position.endCoordinates
+                }),
+                **Item.flat_position(position_dict)
+            }
+            for p in placements if p.item_id in existing_ids
+        ])
+
         db.commit()
+        cache.delete_prefix("container_items:")
         return {
             "success": True,
             "placements": len(placements),
@@ -410,33 +520,8 @@ async def optimize_placement(db: Session = Depends(get_db)):
             "message": f"Placement optimization failed: {str(e)}"
         }
 
-def _find_blocking_items(
-        self,
-        db: Session,
-        target_item: Item
-    ) -> List[Item]:
-        """Find items that need to be moved to retrieve the target item"""
-        if not target_item.position or not target_item.container_id:
-            return []
-
-        blocking_items = []
-        container_items = db.query(Item).filter(
-            Item.container_id == target_item.container_id,
-            Item.itemId != target_item.itemId
-        ).all()
-
-        for item in container_items:
-            if not item.position:
-                continue
-
-            # Check if this item blocks access to target item
-            if self._blocks_access(item, target_item):
-                blocking_items.append(item)
-
-        return blocking_items
-
 @app.post("/api/retrieval/initiate")
-async def initiate_retrieval(
+def initiate_retrieval(
     itemId: str,
     db: Session = Depends(get_db)
 ):
@@ -478,6 +563,7 @@ async def initiate_retrieval(
                 "verificationMessage": verification_message
             }
         )
+        db.commit()
 
         # Format response
         item_data = {
@@ -516,7 +602,7 @@ async def initiate_retrieval(
         )
 
 @app.post("/api/retrieval/confirm")
-async def confirm_retrieval(
+def confirm_retrieval(
     itemId: str,
     userId: str,
     db: Session = Depends(get_db)
@@ -555,6 +641,9 @@ async def confirm_retrieval(
         # Clear container and position
         item.container_id = None
         item.position = None
+        for column, value in Item.flat_position(None).items():
+            setattr(item, column, value)
+        cache.delete(f"container_items:{old_container}")
 
         # Add detailed log entry
         logging_service.add_log(
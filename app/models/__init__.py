@@ -1,11 +1,42 @@
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Float, Integer, DateTime, Boolean, JSON, ForeignKey
-from sqlalchemy.orm import declarative_base, relationship
+from sqlalchemy import Column, String, Float, Integer, DateTime, Boolean, JSON, ForeignKey, Index
+from sqlalchemy.orm import declarative_base, relationship, synonym
+from sqlalchemy.types import TypeDecorator
 
 Base = declarative_base()
 
+class UtcDateTime(TypeDecorator):
+    """DateTime that always reads back timezone-aware UTC.
+
+    SQLite storage strips the offset, so plain DateTime columns come back
+    naive and every consumer had to re-attach UTC in a per-row branch.
+    Normalizing here (aware values to UTC on write, UTC tzinfo restored
+    on read) deletes those branches and makes comparisons against
+    datetime.now(timezone.utc) safe everywhere.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc)
+        return value
+
+    def process_result_value(self, value, dialect):
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
 class Item(Base):
     __tablename__ = "items"
+    __table_args__ = (
+        # Supports the container-contents query used by the inventory UI
+        # and, with the trailing depth column, the blocking-items broad
+        # phase (in-front test pushed into SQL)
+        Index("ix_items_container_waste_y0", "container_id", "is_waste", "y0"),
+        # Supports the expired-items sweep in the time simulation
+        Index("ix_items_expiry_waste", "expiry_date", "is_waste"),
+    )
 
     itemId = Column(String, primary_key=True)
     name = Column(String, nullable=False)
@@ -14,7 +45,7 @@ class Item(Base):
     height = Column(Float, nullable=False)
     mass = Column(Float, nullable=False)
     priority = Column(Integer, nullable=False)
-    expiry_date = Column(DateTime, nullable=True)
+    expiry_date = Column(UtcDateTime, nullable=True)
     usage_limit = Column(Integer, nullable=True)
     uses_remaining = Column(Integer, nullable=True)
     preferred_zone = Column(String, nullable=False)
@@ -22,12 +53,39 @@ class Item(Base):
     position = Column(JSON, nullable=True)
     is_waste = Column(Boolean, default=False)
 
+    # Flat copy of position (x=width, y=depth, z=height; 0=start, 1=end).
+    # The JSON column stays the wire format; these columns exist so hot
+    # queries can filter and read coordinates without JSON decoding
+    x0 = Column(Float, nullable=True)
+    y0 = Column(Float, nullable=True)
+    z0 = Column(Float, nullable=True)
+    x1 = Column(Float, nullable=True)
+    y1 = Column(Float, nullable=True)
+    z1 = Column(Float, nullable=True)
+
     container = relationship("Container", back_populates="items")
 
-    @property
-    def id(self):
-        """Backward compatibility for id attribute"""
-        return self.itemId
+    @staticmethod
+    def flat_position(position) -> dict:
+        """Column values mirroring a position dict (or None to clear)."""
+        if not position:
+            return {"x0": None, "y0": None, "z0": None,
+                    "x1": None, "y1": None, "z1": None}
+        start = position["startCoordinates"]
+        end = position["endCoordinates"]
+        return {
+            "x0": float(start["width"]),
+            "y0": float(start["depth"]),
+            "z0": float(start["height"]),
+            "x1": float(end["width"]),
+            "y1": float(end["depth"]),
+            "z1": float(end["height"])
+        }
+
+    # Backward compatibility for id attribute; a synonym keeps it usable
+    # in query filters (Item.id == ..., Item.id.in_(...)), unlike a plain
+    # Python property
+    id = synonym("itemId")
 
 class Container(Base):
     __tablename__ = "containers"
@@ -42,6 +100,14 @@ class Container(Base):
 
 class Log(Base):
     __tablename__ = "logs"
+    __table_args__ = (
+        # /api/logs filters on a timestamp range plus optional equality
+        # filters, then orders by timestamp
+        Index("ix_logs_ts", "timestamp"),
+        Index("ix_logs_item_ts", "item_id", "timestamp"),
+        Index("ix_logs_user_ts", "user_id", "timestamp"),
+        Index("ix_logs_action_ts", "action_type", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     timestamp = Column(DateTime, nullable=False)
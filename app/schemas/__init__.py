@@ -1,6 +1,6 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 class Coordinates(BaseModel):
     width: float = Field(ge=0)
@@ -103,6 +103,11 @@ class ItemPlacement(BaseModel):
     container_id: str = Field(alias="containerId")
     position: Position
 
+    # Flat (sx, sy, sz, ex, ey, ez) copy of position, filled in by the
+    # placement service so hot loops read one tuple instead of six nested
+    # Pydantic attributes
+    _box: Optional[Tuple[float, ...]] = PrivateAttr(default=None)
+
     class Config:
         populate_by_name = True
         allow_population_by_field_name = True
@@ -125,8 +130,8 @@ class SearchResponse(BaseModel):
     found: bool
     item: Optional[Dict] = None
     retrieval_steps: List[RetrievalStep] = Field(default_factory=list, alias="retrievalSteps")
-    total_items: int = Field(alias="totalItems")
-    active_items: int = Field(alias="activeItems")
+    total_items: int = Field(0, alias="totalItems")
+    active_items: int = Field(0, alias="activeItems")
 
 class RetrievalRequest(BaseModel):
     item_id: str = Field(alias="itemId")
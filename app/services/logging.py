@@ -1,7 +1,7 @@
 from typing import List, Optional, Dict
 from datetime import datetime, timezone
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from ..models import Log
 from ..schemas import LogResponse, LogEntry
 
@@ -14,6 +14,11 @@ class LoggingService:
         item_id: str,
         details: Dict = None
     ) -> bool:
+        """Queue a single log entry on the session.
+
+        The entry is committed together with the caller's transaction
+        rather than in its own one-row transaction here.
+        """
         try:
             log_entry = Log(
                 timestamp=datetime.now(timezone.utc),
@@ -23,10 +28,27 @@ class LoggingService:
                 details=details
             )
             db.add(log_entry)
-            db.commit()
             return True
         except Exception as e:
-            db.rollback()
+            return False
+
+    def add_logs_bulk(
+        self,
+        db: Session,
+        entries: List[Dict]
+    ) -> bool:
+        """Insert many log entries in one executemany statement.
+
+        Each entry is a dict of Log column values; a missing timestamp
+        defaults to now. The caller owns the commit.
+        """
+        try:
+            now = datetime.now(timezone.utc)
+            for entry in entries:
+                entry.setdefault("timestamp", now)
+            db.bulk_insert_mappings(Log, entries)
+            return True
+        except Exception as e:
             return False
 
     def get_logs(
@@ -37,44 +59,39 @@ class LoggingService:
         item_id: str = None,
         user_id: str = None,
         action_type: str = None
-    ) -> Dict[str, List[Dict]]:
+    ) -> LogResponse:
         # Ensure dates are timezone-aware
         if start_date.tzinfo is None:
             start_date = start_date.replace(tzinfo=timezone.utc)
         if end_date.tzinfo is None:
             end_date = end_date.replace(tzinfo=timezone.utc)
-            
-        query = db.query(Log)
-        
-        # Apply date range filter
-        query = query.filter(and_(
+
+        # Select only the needed columns instead of hydrating Log objects
+        stmt = select(
+            Log.timestamp, Log.user_id, Log.action_type, Log.item_id, Log.details
+        ).where(and_(
             Log.timestamp >= start_date,
             Log.timestamp <= end_date
         ))
-        
+
         # Apply optional filters
         if item_id:
-            query = query.filter(Log.item_id == item_id)
+            stmt = stmt.where(Log.item_id == item_id)
         if user_id:
-            query = query.filter(Log.user_id == user_id)
+            stmt = stmt.where(Log.user_id == user_id)
         if action_type:
-            query = query.filter(Log.action_type == action_type)
-            
-        # Order by timestamp
-        query = query.order_by(Log.timestamp)
-        
-        # Convert to response format
-        logs = query.all()
-        
-        return {
-            "logs": [
-                {
-                    "timestamp": log.timestamp.isoformat(),
-                    "userId": log.user_id,
-                    "actionType": log.action_type,
-                    "itemId": log.item_id,
-                    "details": log.details or {}
-                }
-                for log in logs
-            ]
-        }
\ No newline at end of file
+            stmt = stmt.where(Log.action_type == action_type)
+
+        rows = db.execute(stmt.order_by(Log.timestamp)).all()
+
+        # model_construct skips re-validation; the rows came from our own DB
+        return LogResponse.model_construct(logs=[
+            LogEntry.model_construct(
+                timestamp=row[0],
+                user_id=row[1],
+                action_type=row[2],
+                item_id=row[3],
+                details=row[4] or {}
+            )
+            for row in rows
+        ])
\ No newline at end of file
@@ -1,9 +1,11 @@
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import datetime, timezone
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+import numpy as np
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, case
 from ..models import Item, Container
 from ..schemas import SearchResponse, RetrievalStep
+from ..utils.cache import cache
 from .logging import LoggingService
 import logging
 
@@ -17,29 +19,32 @@ class SearchService:
         self,
         db: Session,
         item_id: Optional[str] = None,
-        item_name: Optional[str] = None
-    ) -> Dict[str, Any]:
-        query = db.query(Item)
+        item_name: Optional[str] = None,
+        include_counts: bool = False
+    ) -> SearchResponse:
+        # Eager-load the container in the same statement; building
+        # item_details reads item.container.zone, which would otherwise
+        # lazy-load with a second SELECT
+        query = db.query(Item).options(joinedload(Item.container))
         search_result = None
         
         if item_id:
-            # Check if item exists before filtering
-            all_items = query.all()
-            logger.info(f"All items in db: {[(item.itemId, item.name) for item in all_items]}")
-            
-            query = query.filter(Item.itemId == str(item_id))
-            logger.info(f"Searching for item with ID: {item_id}")
-            search_result = query.first()
-            logger.info(f"Found item: {search_result.itemId if search_result else None}")
+            logger.debug("Searching for item with ID: %s", item_id)
+            search_result = query.filter(Item.itemId == str(item_id)).first()
+            logger.debug(
+                "Found item: %s", search_result.itemId if search_result else None
+            )
         elif item_name:
             search_result = query.filter(Item.name == item_name).first()
 
-        # Log the search activity
+        # Log the search activity. Log.item_id is NOT NULL, so misses are
+        # recorded under the searched term instead of None — otherwise the
+        # commit below fails and every miss turns into a 500
         self.logging_service.add_log(
             db=db,
             user_id="system",  # Replace with actual user ID when authentication is implemented
             action_type="search",
-            item_id=search_result.itemId if search_result else None,
+            item_id=search_result.itemId if search_result else str(item_id or item_name or "unknown"),
             details={
                 "timestamp": datetime.now(timezone.utc).isoformat(),
                 "searchType": "id" if item_id else "name",
@@ -47,14 +52,20 @@ class SearchService:
                 "found": bool(search_result)
             }
         )
+        db.commit()
 
         if not search_result:
-            return {
-                "success": True,
-                "found": False,
-                "totalItems": db.query(func.count(Item.itemId)).scalar() or 0,
-                "activeItems": db.query(func.count(Item.itemId)).filter(Item.is_waste == False).scalar() or 0
-            }
+            # Misses are the common case while callers poll during bulk
+            # imports; skip the count scans unless they were asked for
+            if not include_counts:
+                return SearchResponse(success=True, found=False)
+            total_items, active_items = self._item_counts(db)
+            return SearchResponse(
+                success=True,
+                found=False,
+                totalItems=total_items,
+                activeItems=active_items
+            )
 
         # Generate item details
         item_details = {
@@ -77,11 +88,8 @@ class SearchService:
 
         # Determine status for waste items
         if search_result.is_waste:
-            # Convert expiry_date to timezone-aware if needed
-            if search_result.expiry_date and search_result.expiry_date.tzinfo is None:
-                expiry_date = search_result.expiry_date.replace(tzinfo=timezone.utc)
-            else:
-                expiry_date = search_result.expiry_date
+            # expiry_date is timezone-aware via the UtcDateTime column
+            expiry_date = search_result.expiry_date
 
             if search_result.uses_remaining == 0:
                 item_details["status"] = "Used"
@@ -95,124 +103,136 @@ class SearchService:
         # Calculate retrieval steps
         retrieval_steps = self._calculate_retrieval_steps(db, search_result)
 
-        return {
-            "success": True,
-            "found": True,
-            "item": item_details,
-            "retrievalSteps": retrieval_steps,
-            "totalItems": db.query(func.count(Item.itemId)).scalar() or 0,
-            "activeItems": db.query(func.count(Item.itemId)).filter(Item.is_waste == False).scalar() or 0
-        }
+        total_items, active_items = (
+            self._item_counts(db) if include_counts else (0, 0)
+        )
+        return SearchResponse(
+            success=True,
+            found=True,
+            item=item_details,
+            retrievalSteps=retrieval_steps,
+            totalItems=total_items,
+            activeItems=active_items
+        )
+
+    @staticmethod
+    def _item_counts(db: Session) -> Tuple[int, int]:
+        """Total and active (non-waste) item counts in one aggregated query
+        instead of two separate count(*) round-trips."""
+        total, active = db.query(
+            func.count(Item.itemId),
+            func.coalesce(
+                func.sum(case((Item.is_waste.is_(False), 1), else_=0)), 0
+            )
+        ).one()
+        return int(total or 0), int(active or 0)
 
     def _calculate_retrieval_steps(
         self,
         db: Session,
         target_item: Item
     ) -> List[RetrievalStep]:
-        steps = []
-        step_counter = 1
-
         if not target_item.position or not target_item.container_id:
-            return steps
+            return []
 
-        # Find items blocking direct perpendicular access
+        # Find items blocking direct perpendicular access; they arrive in
+        # retrieval (front-to-back) order, which is the one canonical sort
         blocking_items = self._find_blocking_items(db, target_item)
-        
-        # Sort blocking items by priority (lower priority items moved first)
-        blocking_items.sort(key=lambda x: x.priority)
-
-        # Generate steps for moving blocking items
-        for blocking_item in blocking_items:
-            # Add step to remove blocking item
-            steps.append(RetrievalStep(
-                step=step_counter,
+        blocker_count = len(blocking_items)
+
+        # Remove blockers front to back, retrieve the target, then place
+        # the blockers back in reverse order — built in single passes
+        # rather than append-and-count loops
+        steps = [
+            RetrievalStep(
+                step=index + 1,
                 action="remove",
                 itemId=blocking_item.itemId,
                 itemName=blocking_item.name
-            ))
-            step_counter += 1
-
-        # Add step to retrieve target item
+            )
+            for index, blocking_item in enumerate(blocking_items)
+        ]
         steps.append(RetrievalStep(
-            step=step_counter,
+            step=blocker_count + 1,
             action="retrieve",
             itemId=target_item.itemId,
             itemName=target_item.name
         ))
-        step_counter += 1
-
-        # Add steps to place back blocking items in reverse order (higher priority items placed first)
-        for blocking_item in reversed(blocking_items):
-            steps.append(RetrievalStep(
-                step=step_counter,
+        steps.extend(
+            RetrievalStep(
+                step=blocker_count + 2 + index,
                 action="place",
                 itemId=blocking_item.itemId,
                 itemName=blocking_item.name
-            ))
-            step_counter += 1
-
+            )
+            for index, blocking_item in enumerate(reversed(blocking_items))
+        )
         return steps
 
     def _find_blocking_items(
         self,
         db: Session,
         target_item: Item
-    ) -> List[Item]:
-        """Find items that need to be moved to retrieve the target item"""
+    ) -> List[Any]:
+        """Find items that need to be moved to retrieve the target item.
+
+        Returns lightweight column Rows (itemId, name, priority plus flat
+        coordinates) rather than hydrated Item objects.
+        """
         if not target_item.position or not target_item.container_id:
             return []
 
-        # Get all items in the same container
-        blocking_items = []
-        container_items = db.query(Item).filter(
-            Item.container_id == target_item.container_id,
-            Item.itemId != target_item.itemId,
-            Item.is_waste == False  # Exclude waste items
-        ).all()
-
         target_position = target_item.position
-        target_front_access = float(target_position["startCoordinates"]["depth"])
-        
-        for item in container_items:
-            if not item.position:
-                continue
-
-            item_position = item.position
-            item_depth = float(item_position["startCoordinates"]["depth"])
-            
-            # Check if item is in front of target item
-            if item_depth < target_front_access:
-                # Check if there's overlap in width and height
-                width_overlap = (
-                    float(item_position["endCoordinates"]["width"]) > float(target_position["startCoordinates"]["width"]) and
-                    float(item_position["startCoordinates"]["width"]) < float(target_position["endCoordinates"]["width"])
-                )
-                height_overlap = (
-                    float(item_position["endCoordinates"]["height"]) > float(target_position["startCoordinates"]["height"]) and
-                    float(target_position["startCoordinates"]["height"]) < float(target_position["endCoordinates"]["height"])
-                )
-                
-                if width_overlap and height_overlap:
-                    blocking_items.append(item)
-
-        # Sort blocking items by their depth (front to back)
-        blocking_items.sort(key=lambda x: float(x.position["startCoordinates"]["depth"]))
-        return blocking_items
-
-    def _check_perpendicular_overlap(
-        self,
-        target_start: Dict,
-        target_end: Dict,
-        item_start: Dict,
-        item_end: Dict
-    ) -> bool:
-        """Check if an item blocks the perpendicular access path of the target item"""
-        return not (
-            item_end["width"] <= target_start["width"] or
-            item_start["width"] >= target_end["width"] or
-            item_end["height"] <= target_start["height"] or
-            item_start["height"] >= target_end["height"]
+        tw0 = float(target_position["startCoordinates"]["width"])
+        td0 = float(target_position["startCoordinates"]["depth"])
+        th0 = float(target_position["startCoordinates"]["height"])
+        tw1 = float(target_position["endCoordinates"]["width"])
+        th1 = float(target_position["endCoordinates"]["height"])
+
+        # Bursty audits hit the same container repeatedly, so the
+        # container's positioned rows are cached for a few seconds; the
+        # cache is invalidated wherever positions change. On a miss the
+        # query rides the (container_id, is_waste, y0) index and returns
+        # column tuples sorted front to back, skipping ORM hydration.
+        cache_key = f"container_items:{target_item.container_id}"
+        rows = cache.get(cache_key)
+        if rows is None:
+            rows = db.query(
+                Item.itemId, Item.name, Item.priority,
+                Item.x0, Item.z0, Item.x1, Item.z1, Item.y0
+            ).filter(
+                Item.container_id == target_item.container_id,
+                Item.is_waste == False,  # Exclude waste items
+                Item.y0.isnot(None)
+            ).order_by(Item.y0).all()
+            cache.set(cache_key, rows, ttl=5)
+
+        if not rows:
+            return []
+
+        # Broad phase: rows are y0-sorted, so one searchsorted cut keeps
+        # only boxes in front of the target
+        y0s = np.array([row.y0 for row in rows], dtype=np.float32)
+        in_front = int(np.searchsorted(y0s, td0, side="left"))
+        if in_front == 0:
+            return []
+        candidates = [
+            row for row in rows[:in_front] if row.itemId != target_item.itemId
+        ]
+        if not candidates:
+            return []
+
+        # Narrow phase: blocking means overlapping the target in both
+        # width and height
+        boxes = np.array(
+            [(row.x0, row.z0, row.x1, row.z1) for row in candidates],
+            dtype=np.float32
+        )
+        mask = (
+            (boxes[:, 2] > tw0) & (boxes[:, 0] < tw1) &
+            (boxes[:, 3] > th0) & (boxes[:, 1] < th1)
         )
+        return [candidates[k] for k in np.flatnonzero(mask)]
 
     def log_retrieval(
         self,
@@ -225,38 +245,42 @@ class SearchService:
         if not item:
             return False
 
-        # Update usage count if applicable
-        if item.usage_limit is not None:
-            old_uses = item.uses_remaining
-            item.uses_remaining = max(0, item.uses_remaining - 1)
-            
-            # Log item usage
+        # Nothing to record for items without a usage limit; returning
+        # before the commit avoids paying an fsync for a no-op call
+        if item.usage_limit is None:
+            return True
+
+        # Update usage count
+        old_uses = item.uses_remaining
+        item.uses_remaining = max(0, item.uses_remaining - 1)
+
+        # Log item usage
+        self.logging_service.add_log(
+            db=db,
+            user_id=user_id,
+            action_type="retrieval",
+            item_id=item_id,
+            details={
+                "timestamp": timestamp.isoformat(),
+                "oldUsesRemaining": old_uses,
+                "newUsesRemaining": item.uses_remaining
+            }
+        )
+
+        # Check if item became waste
+        if item.uses_remaining == 0:
+            item.is_waste = True
             self.logging_service.add_log(
                 db=db,
                 user_id=user_id,
-                action_type="retrieval",
+                action_type="disposal",
                 item_id=item_id,
                 details={
-                    "timestamp": timestamp.isoformat(),
-                    "oldUsesRemaining": old_uses,
-                    "newUsesRemaining": item.uses_remaining
+                    "reason": "Out of Uses",
+                    "timestamp": timestamp.isoformat()
                 }
             )
 
-            # Check if item became waste
-            if item.uses_remaining == 0:
-                item.is_waste = True
-                self.logging_service.add_log(
-                    db=db,
-                    user_id=user_id,
-                    action_type="disposal",
-                    item_id=item_id,
-                    details={
-                        "reason": "Out of Uses",
-                        "timestamp": timestamp.isoformat()
-                    }
-                )
-
         db.commit()
         return True
 
@@ -279,6 +303,12 @@ class SearchService:
         # Update item location
         item.container_id = container_id
         item.position = position
+        for column, value in Item.flat_position(position).items():
+            setattr(item, column, value)
+        cache.delete(
+            f"container_items:{old_container}",
+            f"container_items:{container_id}"
+        )
 
         # Log location change
         self.logging_service.add_log(
@@ -30,13 +30,32 @@ class SimulationService:
             "itemsExpiredToday": []
         }
 
-        # Process daily item usage
+        # Fetch every used item in one IN query instead of one SELECT per
+        # usage entry, then look them up from a dict inside the loop
+        used_ids = {
+            str(usage["itemId"])
+            for usage in request.items_to_be_used_per_day
+            if usage.get("itemId")
+        }
+        items_by_id = {
+            item.id: item
+            for item in db.query(Item).filter(Item.id.in_(used_ids)).all()
+        } if used_ids else {}
+
+        # Loop-invariant timestamps formatted once; isoformat is a
+        # non-trivial call to repeat per item
+        current_iso = current_date.isoformat()
+        target_iso = target_date.isoformat()
+
+        # Process daily item usage; log rows are accumulated and written in
+        # one executemany at the end instead of one INSERT per entry
+        usage_logs = []
         for item_usage in request.items_to_be_used_per_day:
             item_id = item_usage.get("itemId")
             if not item_id:
                 continue
 
-            item = db.query(Item).filter(Item.id == str(item_id)).first()
+            item = items_by_id.get(str(item_id))
             if not item or item.is_waste:
                 continue
 
@@ -56,69 +75,82 @@ class SimulationService:
 
                 # Check if item was depleted during simulation
                 if item.uses_remaining == 0 and old_uses > 0:
+                    depleted_iso = (current_date + timedelta(days=old_uses)).isoformat()
                     changes["itemsDepletedToday"].append({
                         "itemId": item.id,
                         "name": item.name,
-                        "depleted_at": (current_date + timedelta(days=old_uses)).isoformat()
+                        "depleted_at": depleted_iso
                     })
                     item.is_waste = True
 
                     # Log depletion
-                    self.logging_service.add_log(
-                        db=db,
-                        user_id="simulation",
-                        action_type="disposal",
-                        item_id=item.id,
-                        details={
+                    usage_logs.append({
+                        "user_id": "simulation",
+                        "action_type": "disposal",
+                        "item_id": item.id,
+                        "details": {
                             "reason": "Out of Uses",
-                            "simulatedDate": target_date.isoformat(),
+                            "simulatedDate": target_iso,
                             "originalUses": old_uses,
-                            "depleted_at": (current_date + timedelta(days=old_uses)).isoformat()
-                        }
-                    )
-
-                # Log each day's usage separately
-                for day in range(min(total_uses, old_uses)):
-                    usage_date = current_date + timedelta(days=day)
-                    self.logging_service.add_log(
-                        db=db,
-                        user_id="simulation",
-                        action_type="retrieval",
-                        item_id=item.id,
-                        details={
-                            "simulatedDate": usage_date.isoformat(),
-                            "oldUsesRemaining": old_uses - day,
-                            "newUsesRemaining": old_uses - day - 1,
-                            "simulated": True
+                            "depleted_at": depleted_iso
                         }
-                    )
+                    })
+
+                # One aggregated usage entry per item covering the whole
+                # simulated span, instead of an INSERT per simulated day
+                usage_logs.append({
+                    "user_id": "simulation",
+                    "action_type": "retrieval",
+                    "item_id": item.id,
+                    "details": {
+                        "simulatedDays": min(total_uses, old_uses),
+                        "fromDate": current_iso,
+                        "toDate": target_iso,
+                        "oldUsesRemaining": old_uses,
+                        "newUsesRemaining": item.uses_remaining,
+                        "simulated": True
+                    }
+                })
 
-        # Check for expired items
-        expired_items = db.query(Item).filter(
+        if usage_logs:
+            self.logging_service.add_logs_bulk(db, usage_logs)
+
+        # Check for expired items; column query returns lightweight tuples
+        # since only id/name/expiry are needed for the report
+        expired_filter = (
             Item.expiry_date <= target_date,
             Item.is_waste == False
-        ).all()
-
-        for item in expired_items:
-            changes["itemsExpiredToday"].append({
-                "itemId": item.id,
-                "name": item.name,
-                "expiryDate": item.expiry_date.isoformat()
-            })
-            item.is_waste = True
-
-            # Log expiration
-            self.logging_service.add_log(
-                db=db,
-                user_id="simulation",
-                action_type="disposal",
-                item_id=item.id,
-                details={
-                    "reason": "Expired",
-                    "expiryDate": item.expiry_date.isoformat(),
-                    "simulatedDate": target_date.isoformat()
-                }
+        )
+        expired_rows = db.query(
+            Item.itemId, Item.name, Item.expiry_date
+        ).filter(*expired_filter).all()
+
+        if expired_rows:
+            expiry_logs = []
+            for item_id, name, expiry_date in expired_rows:
+                expiry_iso = expiry_date.isoformat()
+                changes["itemsExpiredToday"].append({
+                    "itemId": item_id,
+                    "name": name,
+                    "expiryDate": expiry_iso
+                })
+                expiry_logs.append({
+                    "user_id": "simulation",
+                    "action_type": "disposal",
+                    "item_id": item_id,
+                    "details": {
+                        "reason": "Expired",
+                        "expiryDate": expiry_iso,
+                        "simulatedDate": target_iso
+                    }
+                })
+
+            # One UPDATE for the whole expired set instead of a flushed
+            # per-row ORM write, and one executemany for the log entries
+            db.query(Item).filter(*expired_filter).update(
+                {Item.is_waste: True}, synchronize_session=False
             )
+            self.logging_service.add_logs_bulk(db, expiry_logs)
 
         db.commit()
 
@@ -1,70 +1,116 @@
 from typing import List, Dict, Tuple
 from datetime import datetime, timezone
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from ..models import Item, Container
 from ..schemas import WasteItem, ReturnPlanRequest, ReturnManifest, Position
+from ..utils.cache import cache
 from .logging import LoggingService
+import logging
+
+logger = logging.getLogger(__name__)
 
 class WasteManagementService:
     def __init__(self):
         self.logging_service = LoggingService()
+        # (count, min uses_remaining, earliest expiry) over active items
+        # at the end of the last scan; lets dashboard-style repeat calls
+        # skip the table scan when nothing can have become waste
+        self._waste_fingerprint = None
+
+    def _active_fingerprint(self, db: Session) -> Tuple:
+        return tuple(db.query(
+            func.count(Item.itemId),
+            func.min(Item.uses_remaining),
+            func.min(Item.expiry_date)
+        ).filter(Item.is_waste == False).one())
 
     def identify_waste_items(self, db: Session) -> List[WasteItem]:
         current_date = datetime.now(timezone.utc)
-        waste_items = []
 
-        # Query items that are expired or out of uses
-        items = db.query(Item).filter(
+        # Cheap aggregate digest first: if the active set is unchanged
+        # since the last scan, no counter has hit zero and the clock has
+        # not crossed the earliest upcoming expiry, nothing new can be
+        # waste and the scan is skipped
+        fingerprint = self._active_fingerprint(db)
+        count, min_uses, next_expiry = fingerprint
+        if (
+            fingerprint == self._waste_fingerprint
+            and (min_uses is None or min_uses > 0)
+            and (next_expiry is None or current_date < next_expiry)
+        ):
+            return []
+
+        # Expired or out of uses, not yet flagged; the same criteria
+        # drive both the column select and the bulk flag update below
+        waste_filter = (
             ((Item.expiry_date.isnot(None) & (Item.expiry_date <= current_date)) |
             (Item.usage_limit.isnot(None) & (Item.uses_remaining <= 0))) &
             (Item.is_waste == False)
-        ).all()
-
-        for item in items:
+        )
+        rows = db.query(
+            Item.itemId, Item.name, Item.container_id,
+            Item.position, Item.expiry_date
+        ).filter(waste_filter).all()
+        if not rows:
+            # Scan came up empty; the digest above now describes a state
+            # known to contain no pending waste
+            self._waste_fingerprint = fingerprint
+            return []
+
+        identified_iso = current_date.isoformat()
+        waste_items = []
+        log_entries = []
+        for row in rows:
             # Create position model from JSON if it exists
             position = None
-            if item.position:
+            if row.position:
                 position = Position(
-                    start_coordinates=item.position["startCoordinates"],
-                    end_coordinates=item.position["endCoordinates"]
+                    start_coordinates=row.position["startCoordinates"],
+                    end_coordinates=row.position["endCoordinates"]
                 )
 
-            # Convert expiry_date to timezone-aware if needed
-            if item.expiry_date and item.expiry_date.tzinfo is None:
-                expiry_date = item.expiry_date.replace(tzinfo=timezone.utc)
-            else:
-                expiry_date = item.expiry_date
+            # expiry_date arrives timezone-aware from the UtcDateTime column
+            expiry_date = row.expiry_date
 
             waste_item = WasteItem(
-                itemId=str(item.id),  # Ensure string format and use itemId alias
-                name=item.name,
+                itemId=str(row.itemId),  # Ensure string format and use itemId alias
+                name=row.name,
                 reason="Expired" if expiry_date and expiry_date <= current_date else "Out of Uses",
-                containerId=item.container_id or "unknown",  # Use containerId alias
+                containerId=row.container_id or "unknown",  # Use containerId alias
                 position=position or Position(
                     start_coordinates={"width": 0, "depth": 0, "height": 0},
                     end_coordinates={"width": 0, "depth": 0, "height": 0}
                 )
             )
             waste_items.append(waste_item)
-
-            # Mark item as waste in database
-            item.is_waste = True
-            db.add(item)
-
-            # Log waste identification
-            self.logging_service.add_log(
-                db=db,
-                user_id="system",
-                action_type="disposal",
-                item_id=item.id,
-                details={
+            log_entries.append({
+                "user_id": "system",
+                "action_type": "disposal",
+                "item_id": row.itemId,
+                "details": {
                     "reason": waste_item.reason,
-                    "container": item.container_id,
-                    "identified_at": current_date.isoformat()
+                    "container": row.container_id,
+                    "identified_at": identified_iso
                 }
-            )
+            })
+
+        # One UPDATE flags every matched item and one executemany records
+        # the disposals, instead of a per-item add + add_log round trip
+        db.query(Item).filter(waste_filter).update(
+            {Item.is_waste: True}, synchronize_session=False
+        )
+        self.logging_service.add_logs_bulk(db, log_entries)
 
         db.commit()
+        # Flagged items drop out of the cached per-container blocking
+        # rows (they filter on is_waste == False)
+        cache.delete(*{
+            f"container_items:{row.container_id}"
+            for row in rows if row.container_id
+        })
+        # Flagging shrank the active set, so refresh the digest
+        self._waste_fingerprint = self._active_fingerprint(db)
         return waste_items
 
     def plan_waste_return(
@@ -72,11 +118,12 @@ class WasteManagementService:
         db: Session,
         request: ReturnPlanRequest
     ) -> Tuple[List[dict], List[dict], ReturnManifest]:
-        # Get all waste items
-        waste_items = db.query(Item).filter(Item.is_waste == True).all()
-        
-        # Sort waste items by priority (higher priority items returned first)
-        waste_items.sort(key=lambda x: (-x.priority, x.expiry_date or datetime.max))
+        # Waste items pre-sorted by the DB: higher priority first, then
+        # earliest expiry with NULL expiries last — the same ordering the
+        # old Python sort produced, without materializing and re-sorting
+        waste_items = db.query(Item).filter(Item.is_waste == True).order_by(
+            Item.priority.desc(), Item.expiry_date.is_(None), Item.expiry_date
+        ).all()
         
         return_plan = []
         retrieval_steps = []
@@ -222,42 +269,55 @@ class WasteManagementService:
         timestamp: datetime
     ) -> bool:
         try:
-            # Get all waste items in the undocking container
-            items = db.query(Item).filter(
+            # Column select of the waste items in the undocking container;
+            # the rows only feed the totals and log payloads
+            rows = db.query(
+                Item.itemId, Item.mass,
+                (Item.width * Item.depth * Item.height).label("volume")
+            ).filter(
                 Item.container_id == undocking_container_id,
                 Item.is_waste == True
             ).all()
 
             # Calculate total values for logging
-            total_items = len(items)
-            total_mass = sum(item.mass for item in items)
-            total_volume = sum(item.width * item.depth * item.height for item in items)
-
-            # Delete waste items from database
-            for item in items:
-                # Log undocking disposal
-                self.logging_service.add_log(
-                    db=db,
-                    user_id="system",
-                    action_type="disposal",
-                    item_id=item.id,
-                    details={
-                        "undockingContainerId": undocking_container_id,
-                        "timestamp": timestamp.isoformat(),
-                        "disposalType": "undocking",
-                        "totalItems": total_items,
-                        "totalMass": total_mass,
-                        "totalVolume": total_volume
-                    }
-                )
-                db.delete(item)
+            total_items = len(rows)
+            total_mass = sum(row.mass for row in rows)
+            total_volume = sum(row.volume for row in rows)
+
+            # One executemany for all disposal logs instead of a queued
+            # insert per item; the shared details are built once
+            details = {
+                "undockingContainerId": undocking_container_id,
+                "timestamp": timestamp.isoformat(),
+                "disposalType": "undocking",
+                "totalItems": total_items,
+                "totalMass": total_mass,
+                "totalVolume": total_volume
+            }
+            self.logging_service.add_logs_bulk(db, [
+                {
+                    "user_id": "system",
+                    "action_type": "disposal",
+                    "item_id": row.itemId,
+                    "details": details
+                }
+                for row in rows
+            ])
+
+            # One DELETE scoped to the container instead of a statement
+            # per item
+            db.query(Item).filter(
+                Item.container_id == undocking_container_id,
+                Item.is_waste == True
+            ).delete(synchronize_session=False)
 
             # Clear container references
             db.query(Item).filter(
                 Item.container_id == undocking_container_id
-            ).update({"container_id": None, "position": None})
+            ).update({"container_id": None, "position": None, **Item.flat_position(None)})
 
             db.commit()
+            cache.delete(f"container_items:{undocking_container_id}")
             return True
             
         except Exception as e:
@@ -1,85 +1,130 @@
+import asyncio
 import pandas as pd
 import logging
-from typing import List, Dict, Tuple, Optional
-from io import StringIO
+from typing import IO, Iterator, List, Dict, Tuple, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from ..models import Item, Container
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Rows per bulk_insert_mappings call during CSV import
+IMPORT_CHUNK_SIZE = 10_000
+
+# Parse-time dtypes for read_csv: keeps IDs and dates as strings in one
+# pass instead of letting numeric inference run and converting back.
+# Numeric columns are left to pd.to_numeric(errors='coerce') so a bad
+# cell becomes an error row rather than aborting the whole file.
+ITEM_CSV_DTYPES = {
+    'Item ID': str, 'Name': str, 'Expiry Date': str, 'Preferred Zone': str
+}
+CONTAINER_CSV_DTYPES = {'Container ID': str, 'Zone': str}
+
 class CSVHandler:
     @staticmethod
-    async def import_items(db: Session, file_content: bytes) -> Dict:
+    def _item_records(df: pd.DataFrame, row_offset: int = 0) -> Tuple[List[Dict], List[Dict]]:
+        """Turn an item DataFrame into bulk-insert mappings plus error rows.
+
+        All conversions run column-wise (pandas/NumPy kernels) instead of
+        once per row; invalid rows are detected with boolean masks and
+        reported with the same 1-based row numbers as the old loop.
+        """
+        raw_id = df['Item ID'].astype(str).str.strip()
+        # Preserve 3-digit IDs: pad unless the value already starts with 0
+        item_id = raw_id.where(raw_id.str.startswith('0'), raw_id.str.zfill(3))
+
+        width = pd.to_numeric(df['Width'], errors='coerce')
+        depth = pd.to_numeric(df['Depth'], errors='coerce')
+        height = pd.to_numeric(df['Height'], errors='coerce')
+        mass = pd.to_numeric(df['Mass'], errors='coerce')
+        priority = pd.to_numeric(df['Priority'], errors='coerce')
+        usage_limit = pd.to_numeric(df['Usage Limit'], errors='coerce')
+
+        raw_expiry = df['Expiry Date']
+        expiry = pd.to_datetime(raw_expiry, errors='coerce', utc=True, format='mixed')
+        # Naive timestamps (no explicit offset in the string) land at the
+        # end of their day, matching the old per-row parser
+        naive = expiry.notna() & ~raw_expiry.astype(str).str.contains(
+            r'(?:Z|[+-]\d{2}:?\d{2})$', na=False
+        )
+        expiry = expiry.mask(
+            naive,
+            expiry.dt.normalize() + pd.Timedelta(hours=23, minutes=59, seconds=59)
+        )
+
+        bad = (
+            width.isna() | depth.isna() | height.isna() | mass.isna()
+            | priority.isna()
+            # Expiry present but unparseable was an error row before too
+            | (raw_expiry.notna() & expiry.isna())
+        )
+
+        out = pd.DataFrame({
+            "itemId": item_id,
+            "name": df['Name'].astype(str).str.strip(),
+            "width": width,
+            "depth": depth,
+            "height": height,
+            "mass": mass,
+            "priority": priority,
+            "expiry_date": expiry.astype(object).where(expiry.notna(), None),
+            "usage_limit": usage_limit.astype(object).where(usage_limit.notna(), None),
+            "preferred_zone": df['Preferred Zone'].astype(str).str.strip(),
+        })[~bad]
+        out["priority"] = out["priority"].astype(int)
+        out["usage_limit"] = out["usage_limit"].map(
+            lambda v: int(v) if v is not None else None
+        )
+        out["uses_remaining"] = out["usage_limit"]
+        out["is_waste"] = False
+
+        errors = [
+            {"row": row_offset + int(index) + 1, "message": "Invalid or missing value"}
+            for index in df.index[bad]
+        ]
+        return out.to_dict("records"), errors
+
+    @staticmethod
+    async def import_items(db: Session, file_obj: IO) -> Dict:
+        # Parsing and the bulk inserts are synchronous CPU/DB work; run
+        # them in a worker thread so the event loop keeps serving other
+        # requests during large imports
+        return await asyncio.to_thread(CSVHandler._import_items_sync, db, file_obj)
+
+    @staticmethod
+    def _import_items_sync(db: Session, file_obj: IO) -> Dict:
         try:
-            logger.info(f"Starting item import with session {id(db)}")
-            df = pd.read_csv(StringIO(file_content.decode()))
-            logger.info(f"CSV columns: {df.columns.tolist()}")
-            logger.info(f"Number of rows: {len(df)}")
-            
-            items_imported = 0
-            errors = []
+            # Stream the upload in chunks so only one chunk's rows and
+            # mappings are alive at a time, whatever the file size
+            reader = pd.read_csv(
+                file_obj, dtype=ITEM_CSV_DTYPES, chunksize=IMPORT_CHUNK_SIZE
+            )
 
             try:
-                # Clear existing items
-                count = db.query(Item).delete()
-                logger.info(f"Deleted {count} existing items")
-                db.flush()
-
-                for index, row in df.iterrows():
-                    try:
-                        # Format item ID to ensure 3-digit format
-                        raw_id = str(row['Item ID']).strip()
-                        item_id = raw_id if raw_id.startswith('0') else raw_id.zfill(3)
-
-                        # Convert expiry date string to timezone-aware datetime
-                        expiry_date = None
-                        if pd.notna(row['Expiry Date']):
-                            try:
-                                # Try parsing as ISO format first
-                                expiry_date = datetime.fromisoformat(row['Expiry Date'])
-                            except ValueError:
-                                # Fall back to parsing common date formats
-                                expiry_date = datetime.strptime(str(row['Expiry Date']), '%Y-%m-%d')
-                            
-                            # Ensure timezone awareness
-                            if expiry_date.tzinfo is None:
-                                expiry_date = expiry_date.replace(
-                                    hour=23, minute=59, second=59,  # Set to end of day
-                                    tzinfo=timezone.utc
-                                )
-
-                        # Create new item
-                        item = Item(
-                            itemId=item_id,
-                            name=str(row['Name']).strip(),
-                            width=float(row['Width']),
-                            depth=float(row['Depth']),
-                            height=float(row['Height']),
-                            mass=float(row['Mass']),
-                            priority=int(row['Priority']),
-                            expiry_date=expiry_date,
-                            usage_limit=int(row['Usage Limit']) if pd.notna(row['Usage Limit']) else None,
-                            uses_remaining=int(row['Usage Limit']) if pd.notna(row['Usage Limit']) else None,
-                            preferred_zone=str(row['Preferred Zone']).strip(),
-                            is_waste=False
-                        )
-                        logger.info(f"Created item with ID: {item_id}")
-                        
-                        db.add(item)
-                        db.flush()
-                        items_imported += 1
-
-                    except Exception as e:
-                        logger.error(f"Error importing row {index + 1}: {str(e)}")
-                        errors.append({
-                            "row": index + 1,
-                            "message": str(e)
-                        })
-                        continue
+                # Clear existing items; the table is being replaced
+                # wholesale, so skip the identity-map sync. Query-level
+                # delete executes immediately, so no flush is needed —
+                # the wipe and the inserts share one transaction ended
+                # by the commit below
+                db.query(Item).delete(synchronize_session=False)
+
+                items_imported = 0
+                errors = []
+                row_offset = 0
+                # One executemany per chunk instead of an INSERT+flush per row
+                for chunk in reader:
+                    rows = len(chunk)
+                    mappings, chunk_errors = CSVHandler._item_records(
+                        chunk.reset_index(drop=True), row_offset
+                    )
+                    db.bulk_insert_mappings(Item, mappings)
+                    items_imported += len(mappings)
+                    errors.extend(chunk_errors)
+                    row_offset += rows
 
                 db.commit()
-                logger.info(f"Successfully imported {items_imported} items")
+                logger.info("Imported %d items, %d errors", items_imported, len(errors))
 
                 return {
                     "success": True,
@@ -88,7 +133,7 @@ class CSVHandler:
                 }
 
             except Exception as e:
-                logger.error(f"Transaction error: {str(e)}")
+                logger.error("Transaction error: %s", e)
                 db.rollback()
                 return {
                     "success": False,
@@ -97,7 +142,7 @@ class CSVHandler:
                 }
 
         except Exception as e:
-            logger.error(f"File processing error: {str(e)}")
+            logger.error("File processing error: %s", e)
             return {
                 "success": False,
                 "itemsImported": 0,
@@ -105,54 +150,70 @@ class CSVHandler:
             }
 
     @staticmethod
-    async def import_containers(db: Session, file_content: bytes) -> Dict:
+    def _container_records(df: pd.DataFrame, row_offset: int = 0) -> Tuple[List[Dict], List[Dict]]:
+        """Container counterpart of _item_records."""
+        raw_id = df['Container ID'].astype(str).str.strip()
+        # Rows without the cont prefix fall back to contA, contB, ... by
+        # overall row position, as the old loop did
+        generated = pd.Series(
+            [f"cont{chr(65 + row_offset + i)}" for i in range(len(df))],
+            index=df.index
+        )
+        container_id = raw_id.where(raw_id.str.startswith('cont'), generated)
+
+        width = pd.to_numeric(df['Width'], errors='coerce')
+        depth = pd.to_numeric(df['Depth'], errors='coerce')
+        height = pd.to_numeric(df['Height'], errors='coerce')
+        bad = width.isna() | depth.isna() | height.isna() | df['Zone'].isna()
+
+        out = pd.DataFrame({
+            "id": container_id,
+            "zone": df['Zone'],
+            "width": width,
+            "depth": depth,
+            "height": height,
+        })[~bad]
+
+        errors = [
+            {"row": row_offset + int(index) + 1, "message": "Invalid or missing value"}
+            for index in df.index[bad]
+        ]
+        return out.to_dict("records"), errors
+
+    @staticmethod
+    async def import_containers(db: Session, file_obj: IO) -> Dict:
+        return await asyncio.to_thread(CSVHandler._import_containers_sync, db, file_obj)
+
+    @staticmethod
+    def _import_containers_sync(db: Session, file_obj: IO) -> Dict:
         try:
-            logger.info("Starting container import")
-            df = pd.read_csv(StringIO(file_content.decode()))
-            
-            containers_imported = 0
-            errors = []
+            reader = pd.read_csv(
+                file_obj, dtype=CONTAINER_CSV_DTYPES, chunksize=IMPORT_CHUNK_SIZE
+            )
 
             try:
-                # Clear existing containers
-                db.query(Container).delete()
-                db.flush()
-
-                for index, row in df.iterrows():
-                    try:
-                        # Format container ID (cont + uppercase letter)
-                        raw_id = str(row['Container ID']).strip()
-                        if not raw_id.startswith('cont'):
-                            container_id = f"cont{chr(65 + containers_imported)}"  # A, B, C, etc.
-                        else:
-                            container_id = raw_id
-
-                        container = Container(
-                            id=container_id,
-                            zone=row['Zone'],
-                            width=float(row['Width']),
-                            depth=float(row['Depth']),
-                            height=float(row['Height'])
-                        )
-                        logger.info(f"Created container: {container_id}")
-                        
-                        db.add(container)
-                        db.flush()
-                        containers_imported += 1
-
-                    except Exception as e:
-                        logger.error(f"Error importing row {index + 1}: {str(e)}")
-                        errors.append({
-                            "row": index + 1,
-                            "message": str(e)
-                        })
-                        continue
+                # Clear existing containers; same wholesale replacement,
+                # same single transaction
+                db.query(Container).delete(synchronize_session=False)
+
+                containers_imported = 0
+                errors = []
+                row_offset = 0
+                for chunk in reader:
+                    rows = len(chunk)
+                    mappings, chunk_errors = CSVHandler._container_records(
+                        chunk.reset_index(drop=True), row_offset
+                    )
+                    db.bulk_insert_mappings(Container, mappings)
+                    containers_imported += len(mappings)
+                    errors.extend(chunk_errors)
+                    row_offset += rows
 
                 db.commit()
-                logger.info(f"Successfully imported {containers_imported} containers")
+                logger.info("Imported %d containers, %d errors", containers_imported, len(errors))
 
             except Exception as e:
-                logger.error(f"Transaction error: {str(e)}")
+                logger.error("Transaction error: %s", e)
                 db.rollback()
                 return {
                     "success": False,
@@ -167,7 +228,7 @@ class CSVHandler:
             }
 
         except Exception as e:
-            logger.error(f"File processing error: {str(e)}")
+            logger.error("File processing error: %s", e)
             return {
                 "success": False,
                 "containersImported": 0,
@@ -213,32 +274,42 @@ class CSVHandler:
         except FileNotFoundError:
             return False, "Arrangement CSV file not found"
         except Exception as e:
-            logger.error(f"Error verifying arrangement: {str(e)}")
+            logger.error("Error verifying arrangement: %s", e)
             return False, f"Error verifying arrangement: {str(e)}"
 
     @staticmethod
-    def export_arrangement(db: Session) -> str:
-        # Query all items with their positions
-        items = db.query(Item).filter(Item.container_id.isnot(None)).all()
-        
-        # Prepare data for CSV
-        rows = []
-        for item in items:
-            if item.position:
-                position_str = (
-                    f"({item.position['startCoordinates']['width']},"
-                    f"{item.position['startCoordinates']['depth']},"
-                    f"{item.position['startCoordinates']['height']}),"
-                    f"({item.position['endCoordinates']['width']},"
-                    f"{item.position['endCoordinates']['depth']},"
-                    f"{item.position['endCoordinates']['height']})"
+    def export_arrangement(db: Session) -> Iterator[bytes]:
+        """Yield the arrangement CSV in chunks for a StreamingResponse.
+
+        Reads against the session's engine directly, so the stream keeps
+        working after the request-scoped session is torn down; memory
+        stays bounded by one chunk regardless of table size.
+        """
+        bind = db.get_bind()
+        yield b"Item ID,Container ID,Coordinates\n"
+
+        # Column query on the flat position mirror: no ORM hydration and
+        # no JSON decoding per row
+        chunks = pd.read_sql_query(
+            select(
+                Item.itemId, Item.container_id,
+                Item.x0, Item.y0, Item.z0, Item.x1, Item.y1, Item.z1
+            ).where(Item.container_id.isnot(None), Item.x0.isnot(None)),
+            bind,
+            chunksize=IMPORT_CHUNK_SIZE
+        )
+        for df in chunks:
+            # Build the coordinate strings with vectorized concatenation
+            # instead of an f-string per row
+            x0, y0, z0, x1, y1, z1 = (
+                df[c].astype(str) for c in ('x0', 'y0', 'z0', 'x1', 'y1', 'z1')
+            )
+            out = pd.DataFrame({
+                'Item ID': df['itemId'],
+                'Container ID': df['container_id'],
+                'Coordinates': (
+                    '(' + x0 + ',' + y0 + ',' + z0 + '),'
+                    '(' + x1 + ',' + y1 + ',' + z1 + ')'
                 )
-                rows.append({
-                    'Item ID': item.id,
-                    'Container ID': item.container_id,
-                    'Coordinates': position_str
-                })
-        
-        # Convert to DataFrame and then to CSV
-        df = pd.DataFrame(rows)
-        return df.to_csv(index=False)
\ No newline at end of file
+            })
+            yield out.to_csv(index=False, header=False).encode()
\ No newline at end of file
@@ -1,6 +1,6 @@
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
 import logging
 
 logger = logging.getLogger(__name__)
@@ -8,15 +8,44 @@ logger = logging.getLogger(__name__)
 # Use in-memory SQLite for testing
 SQLALCHEMY_DATABASE_URL = "sqlite:///./space_station.db"
 
-# Create engine with check_same_thread=False for SQLite
+# Create engine with a sized connection pool so concurrent requests each
+# get a connection instead of serializing on a single shared one
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool  # Use StaticPool for better concurrency in tests
+    poolclass=QueuePool,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,  # Drop dead connections instead of erroring mid-request
+    pool_recycle=3600
 )
 
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Tune each new SQLite connection for throughput.
+
+    WAL lets readers run alongside the writer and synchronous=NORMAL
+    drops the per-commit fsync (WAL keeps commits durable at checkpoint
+    granularity, which is fine for a rebuildable inventory DB). The
+    memory pragmas keep sorts/temp B-trees and a 64 MB page cache off
+    disk, with the file mmap'd up to 256 MB.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# One session per request. A thread-keyed scoped_session is unsafe here:
+# FastAPI runs a sync dependency's setup, the handler, and its teardown
+# as separate threadpool calls, so the thread identity can change
+# mid-request and sessions would be shared or closed across requests.
+# Connection reuse already comes from the engine's QueuePool.
 def get_db() -> Session:
     db = SessionLocal()
     try:
@@ -25,17 +54,43 @@ def get_db() -> Session:
         db.close()
 
 def init_db():
-    from ..models import Base, Item, Container
+    from sqlalchemy import text
+    from ..models import Base, Item, Container, Log
     inspector = inspect(engine)
-    
+
     # Get existing tables
     existing_tables = inspector.get_table_names()
     logger.info(f"Existing tables: {existing_tables}")
-    
+
     # Create tables if they don't exist
     if not all(table in existing_tables for table in ['items', 'containers', 'logs']):
         logger.info("Creating database tables...")
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
     else:
-        logger.info("All required tables already exist")
\ No newline at end of file
+        logger.info("All required tables already exist")
+
+    # Lightweight in-place migration: add the flat position columns to an
+    # existing items table and backfill them from the JSON position
+    if 'items' in existing_tables:
+        item_columns = {col["name"] for col in inspector.get_columns("items")}
+        flat_columns = ("x0", "y0", "z0", "x1", "y1", "z1")
+        missing = [col for col in flat_columns if col not in item_columns]
+        if missing:
+            logger.info(f"Adding flat position columns: {missing}")
+            with engine.begin() as conn:
+                for col in missing:
+                    conn.execute(text(f"ALTER TABLE items ADD COLUMN {col} FLOAT"))
+            with SessionLocal() as db:
+                for item in db.query(Item).filter(Item.position.isnot(None)).all():
+                    for column, value in Item.flat_position(item.position).items():
+                        setattr(item, column, value)
+                db.commit()
+
+    # create_all skips indexes declared on tables that already exist, so
+    # databases created before an index was added never get it; create
+    # any missing ones explicitly. Item's indexes must come after the
+    # column migration above — ix_items_container_waste_y0 covers y0
+    for table in (Item.__table__, Log.__table__):
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
\ No newline at end of file
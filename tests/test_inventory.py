@@ -203,10 +203,11 @@ def test_csv_import_export(test_db, client):
     item = test_db.query(Item).filter(Item.id == "001").first()
     assert item is not None, "Item was not properly imported"
     
-    # Test arrangement export
+    # Test arrangement export (streamed CSV, not a JSON envelope)
     export_response = client.get("/api/export/arrangement")
     assert export_response.status_code == 200
-    assert "content" in export_response.json()
+    assert export_response.headers["content-type"].startswith("text/csv")
+    assert export_response.text.startswith("Item ID,Container ID,Coordinates")
 
 def test_logging(test_db, client):
     """Test action logging"""